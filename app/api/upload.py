@@ -1,19 +1,47 @@
-import json
-import docx
-import pandas as pd
-import pdfplumber
+import asyncio
+import os
+import re
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+import pyarrow.csv as pacsv
+from lxml import etree
+from python_calamine import CalamineWorkbook
 from fastapi import APIRouter, UploadFile, File, HTTPException, Request, Depends
+from pydantic import ValidationError
 from app.auth import get_current_user
 from app.utils.api_client import send_data_to_saas_api
 from app.utils.file_utils import save_and_validate_file
-from app.services.validation import validate_onboarding_data
+from app.utils.upload_cache import upload_cache_key, get_cached_response, cache_response
+from app.services.validation import validate_onboarding_batch
 from app.utils.logger import log_error
-from slowapi import Limiter
+from app.utils.rate_limiter import limiter
+
+try:
+    import pymupdf  # PyMuPDF (formerly imported as `fitz`), preferred for fast PDF text extraction
+except ImportError:  # Fall back to pdfplumber when PyMuPDF is not installed
+    pymupdf = None
+    import pdfplumber
 
 router = APIRouter()
 
-# Initialize rate limiter
-limiter = Limiter(key_func=lambda request: request.client.host)
+# Pattern for one PDF table row: the name, an email address and a numeric age, with any trailing columns ignored.
+# Header and empty lines have no email address, so they never match.
+ROW_RE = re.compile(r'^[ \t]*(\S.*?)[ \t]+(\S+@\S+)[ \t]+(\d+)(?:[ \t].*)?$', re.M)
+
+# WordprocessingML element names used to locate tables, rows, cells and text in `word/document.xml`
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+W_TBL = f"{{{W_NS}}}tbl"
+W_TR = f"{{{W_NS}}}tr"
+W_TC = f"{{{W_NS}}}tc"
+W_P = f"{{{W_NS}}}p"
+W_T = f"{{{W_NS}}}t"
+
+# Size of the blocks the CSV reader splits a file into for parallel parsing (1 MiB)
+CSV_BLOCK_SIZE = 1 << 20
+
+# Thread pool for the blocking file parsers so they do not stall the event loop
+_PARSE_POOL = ThreadPoolExecutor(max_workers=os.cpu_count())
 
 
 @router.post("/upload")
@@ -38,53 +66,165 @@ async def upload_file(request: Request, file: UploadFile = File(...),
     """
     try:
         # Save and validate the uploaded file
-        file_path = await save_and_validate_file(file)
-
-        # Process the file content based on the file type
-        if file.content_type == 'application/json':
-            onboarding_data = pd.read_json(file_path)
-            onboarding_data = onboarding_data.to_dict(orient='records')
-        elif file.content_type == 'text/csv':
-            onboarding_data = pd.read_csv(file_path).to_dict(orient='records')
-        elif file.content_type in ['application/vnd.ms-excel', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet']:
-            onboarding_data = pd.read_excel(file_path).to_dict(orient='records')
-        elif file.content_type == 'application/pdf':  # Handle PDF files
-            onboarding_data = await handle_pdf(file_path)
-        elif file.content_type == 'application/vnd.openxmlformats-officedocument.wordprocessingml.document':  # Handle DOCX
-            onboarding_data = await handle_docx(file_path)
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file type")
-
-        # Validate the extracted data
-        validated_data = []
-        for entry in onboarding_data:
-            try:
-                # Validate each entry using the defined onboarding data model
-                validated_entry = validate_onboarding_data(entry)
-                validated_data.append(validated_entry)
-            except ValueError as e:
-                # Log validation errors and raise an exception
-                log_error(e)
-                raise HTTPException(status_code=400, detail=f"Validation error in {json.loads(e.args[0])[0]['loc'][0]} column data")
-
-        # Send the validated data to the SaaS platform
-        response = await send_data_to_saas_api(validated_data)
+        file_path, digest = await save_and_validate_file(file)
+
+        # Skip parsing, validation and the SaaS call if the same file content was already processed
+        cache_key = upload_cache_key(file.content_type, digest)
+        response = await get_cached_response(cache_key)
+        if response is None:
+            response = await process_file(file_path, file.content_type)
+            await cache_response(cache_key, response)
 
         # Return success response if data is validated and sent successfully
         return {
             "status": "Success",
             "message": "File uploaded, data validated, saved, and successfully sent to the SaaS platform.",
-            "saas_api_response": response  # Optional: include SaaS API response
+            "saas_api_response": response  # Optional: include the SaaS API response of each batch
         }
 
+    except HTTPException:
+        # Propagate HTTP errors raised above (e.g. 400, 413) with their own status code
+        raise
     except Exception as e:
         # Log any unexpected errors and raise an HTTPException
         log_error(e)
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
 
 
+# Helper function to run a saved file through parsing, validation and the SaaS API
+async def process_file(file_path, content_type: str):
+    """
+    Helper function to parse a saved file, validate its records and send them to the SaaS platform.
+
+    Args:
+        file_path: Path to the saved file.
+        content_type: The content type reported for the uploaded file.
+
+    Returns:
+        The list of SaaS API responses, one per batch of records sent.
+
+    Raises:
+        HTTPException: For unsupported file types, validation errors, or SaaS API errors.
+    """
+    # Parse the file content in the thread pool, based on the file type
+    loop = asyncio.get_running_loop()
+    onboarding_data = await loop.run_in_executor(_PARSE_POOL, parse_file, file_path, content_type)
+
+    # Validate all the extracted entries using the defined onboarding data model
+    try:
+        validated_data = validate_onboarding_batch(onboarding_data)
+    except ValidationError as e:
+        # Log validation errors and report the column of the first failing field
+        log_error(e)
+        raise HTTPException(status_code=400, detail=f"Validation error in {e.errors()[0]['loc'][-1]} column data")
+
+    # Send the validated data to the SaaS platform
+    return await send_data_to_saas_api(validated_data)
+
+
+# Helper function to parse an uploaded file into onboarding records
+def parse_file(file_path, content_type: str):
+    """
+    Helper function to extract onboarding records from a saved file based on its content type.
+    This function blocks on disk I/O and parsing, so it is meant to run in the parse thread pool.
+
+    Args:
+        file_path: Path to the saved file.
+        content_type: The content type reported for the uploaded file.
+
+    Returns:
+        A list of dictionaries containing the extracted records.
+
+    Raises:
+        HTTPException: If the file type is unsupported or the file cannot be parsed.
+    """
+    if content_type == 'application/json':
+        with open(file_path, 'rb') as f:
+            return records_from_json(orjson.loads(f.read()))
+    elif content_type == 'text/csv':
+        # Arrow's multithreaded CSV reader builds the records without an intermediate DataFrame
+        read_options = pacsv.ReadOptions(use_threads=True, block_size=CSV_BLOCK_SIZE)
+        return pacsv.read_csv(file_path, read_options=read_options).to_pylist()
+    elif content_type in ['application/vnd.ms-excel', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet']:
+        # Read the first sheet with calamine and map each row onto the header row
+        rows = CalamineWorkbook.from_path(str(file_path)).get_sheet_by_index(0).to_python()
+        if not rows:
+            return []
+        header = rows[0]
+        return [dict(zip(header, row)) for row in rows[1:]]
+    elif content_type == 'application/pdf':  # Handle PDF files
+        return handle_pdf(file_path)
+    elif content_type == 'application/vnd.openxmlformats-officedocument.wordprocessingml.document':  # Handle DOCX
+        return handle_docx(file_path)
+    else:
+        raise HTTPException(status_code=400, detail="Unsupported file type")
+
+
+# Helper function to normalize parsed JSON into onboarding records
+def records_from_json(data):
+    """
+    Helper function to turn parsed JSON into a list of records.
+    Accepts a list of records, or a column-oriented object mapping each column to a list of values
+    (or to an index -> value object, as written by pandas).
+
+    Args:
+        data: The parsed JSON document.
+
+    Returns:
+        A list of dictionaries, one per record.
+
+    Raises:
+        HTTPException: If the JSON document is not in one of the supported layouts, or its columns differ in length.
+    """
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        columns = {key: list(values.values()) if isinstance(values, dict) else values for key, values in data.items()}
+        if all(isinstance(values, list) for values in columns.values()):
+            if len({len(values) for values in columns.values()}) > 1:
+                raise HTTPException(status_code=400, detail="JSON columns must all have the same number of values")
+            return [dict(zip(columns, row)) for row in zip(*columns.values())]
+    raise HTTPException(status_code=400, detail="JSON file must contain a list of records")
+
+
+# Helper function to extract the raw text of a PDF file
+def extract_pdf_text(file_path: str) -> str:
+    """
+    Extract the text of every page of a PDF file, one table row per line.
+    Uses PyMuPDF when it is available and falls back to pdfplumber otherwise.
+
+    Args:
+        file_path: Path to the uploaded PDF file.
+
+    Returns:
+        The text of all pages joined by newlines.
+    """
+    if pymupdf is not None:
+        lines = []
+        doc = pymupdf.open(file_path)
+        try:
+            for page in doc:
+                # PyMuPDF emits each table cell as its own block, so rebuild the rows by grouping text
+                # spans that share a baseline and ordering them from left to right. The baseline (span
+                # origin) is used rather than the bounding box, which varies with the font and size.
+                rows = {}
+                for block in page.get_text("dict")["blocks"]:
+                    for line in block.get("lines", ()):
+                        for span in line["spans"]:
+                            text = span["text"].strip()
+                            if text:
+                                rows.setdefault(round(span["origin"][1]), []).append((span["bbox"][0], text))
+                lines.extend(" ".join(text for _, text in sorted(spans)) for _, spans in sorted(rows.items()))
+        finally:
+            doc.close()
+        return "\n".join(lines)
+
+    with pdfplumber.open(file_path) as pdf:
+        return "\n".join(page.extract_text() or "" for page in pdf.pages)
+
+
 # Helper function to handle PDF files
-async def handle_pdf(file_path: str):
+def handle_pdf(file_path: str):
     """
     Helper function to extract data from a PDF file.
     The function assumes that the PDF contains a structured format with columns like name, email, and age.
@@ -99,30 +239,12 @@ async def handle_pdf(file_path: str):
         HTTPException: If no valid data is found or there's an error during extraction.
     """
     try:
-        extracted_data = []
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                text = page.extract_text()
-                if text:
-                    lines = text.split('\n')
-                    # Process each line based on structure
-                    for line in lines:
-                        # Skip headers and empty lines
-                        if line.strip().lower().startswith('name') or not line.strip():
-                            continue
-
-                        # Use regular expression to capture email and age, assuming age is at the end
-                        columns = line.split()
-                        email_idx = next((i for i, word in enumerate(columns) if "@" in word), -1)
-
-                        if email_idx != -1 and len(columns) > email_idx + 1:
-                            # Reconstruct name from all parts before the email
-                            name = " ".join(columns[:email_idx])
-                            email = columns[email_idx]
-                            # Extract the age (last column)
-                            age = columns[email_idx + 1]
-                            if re.match(r'^\d+$', age):  # Ensure age is a valid number
-                                extracted_data.append({"name": name, "email": email, "age": int(age)})
+        text = extract_pdf_text(file_path)
+        # Match every row of the document in a single pass
+        extracted_data = [
+            {"name": m.group(1), "email": m.group(2), "age": int(m.group(3))}
+            for m in ROW_RE.finditer(text)
+        ]
 
         if not extracted_data:
             raise HTTPException(status_code=400, detail="No valid data found in the PDF")
@@ -132,7 +254,7 @@ async def handle_pdf(file_path: str):
 
 
 # Helper function to handle DOCX files
-async def handle_docx(file_path: str):
+def handle_docx(file_path: str):
     """
     Helper function to extract data from a DOCX file.
     Assumes the DOCX file contains structured tables with columns: name, email, and age.
@@ -147,29 +269,50 @@ async def handle_docx(file_path: str):
         HTTPException: If no valid data is found or there's an error during extraction.
     """
     try:
-        # Load the DOCX file
-        doc = docx.Document(file_path)
         extracted_data = []
+        # Number of rows seen so far in each table currently open (nested tables push a new entry)
+        row_counts = []
+
+        # Stream the document body and only look at tables, instead of loading the whole document model.
+        # Entities are never expanded and no DTD or network resource is loaded, so an uploaded document
+        # cannot pull server files (XXE) into the extracted data.
+        with zipfile.ZipFile(file_path) as archive, archive.open("word/document.xml") as document:
+            for event, element in etree.iterparse(
+                document, events=("start", "end"), tag=(W_TBL, W_TR),
+                resolve_entities=False, load_dtd=False, no_network=True,
+            ):
+                if element.tag == W_TBL:
+                    if event == "start":
+                        row_counts.append(0)
+                    else:
+                        row_counts.pop()
+                        if not row_counts:
+                            # Free the finished top-level table and everything before it
+                            element.clear()
+                            while element.getprevious() is not None:
+                                del element.getparent()[0]
+                    continue
 
-        # Process each table (assuming the first table has the data)
-        for table in doc.tables:
-            for i, row in enumerate(table.rows):
-                # Skip the header row
-                if i == 0:
+                if event == "start":
                     continue
 
-                # Extract name, email, and age from the table's columns
-                name = row.cells[0].text.strip()
-                email = row.cells[1].text.strip()
-                age = row.cells[2].text.strip()
+                row_counts[-1] += 1
+                # Only use rows of top-level tables, skipping each table's header row
+                if len(row_counts) == 1 and row_counts[-1] > 1:
+                    # Extract name, email, and age from the table's columns
+                    cells = [_docx_cell_text(cell) for cell in element.iterchildren(W_TC)]
+                    name = cells[0]
+                    email = cells[1]
+                    age = cells[2]
 
-                # Ensure age is numeric
-                if age.isdigit():
-                    extracted_data.append({
-                        "name": name,
-                        "email": email,
-                        "age": int(age)
-                    })
+                    # Ensure age is numeric
+                    if age.isdigit():
+                        extracted_data.append({
+                            "name": name,
+                            "email": email,
+                            "age": int(age)
+                        })
+                    element.clear()
 
         if not extracted_data:
             raise HTTPException(status_code=400, detail="No valid data found in the DOCX file")
@@ -177,3 +320,17 @@ async def handle_docx(file_path: str):
 
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error processing DOCX file: {str(e)}")
+
+
+# Helper function to read the text of a DOCX table cell
+def _docx_cell_text(cell) -> str:
+    """
+    Return the stripped text of a DOCX table cell, joining its paragraphs with newlines.
+
+    Args:
+        cell: The `w:tc` element of the cell.
+
+    Returns:
+        The text of the cell.
+    """
+    return "\n".join("".join(t.text or "" for t in p.iter(W_T)) for p in cell.iterchildren(W_P)).strip()
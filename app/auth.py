@@ -1,4 +1,9 @@
+import asyncio
 import os
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass, replace
+from cachetools import TTLCache
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
@@ -8,6 +13,9 @@ from datetime import datetime, timedelta
 from typing import Optional
 from dotenv import load_dotenv  # Import dotenv to load environment variables
 
+from app.config import USERS_DB_PATH
+from app.utils.user_store import UserStore
+
 # OAuth2PasswordBearer dependency for getting token from the request
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
@@ -19,11 +27,25 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = "HS256"  # Algorithm used for JWT encoding
 ACCESS_TOKEN_EXPIRE_MINUTES = 30  # Token expiration time in minutes
 
-# Context for password hashing using bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-# In-memory user storage for demo purposes
-fake_users_db = {}
+# Context for password hashing using Argon2id (19 MiB memory, 2 iterations, 1 lane).
+# bcrypt is kept as a legacy scheme so existing bcrypt hashes still verify.
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,
+    argon2__parallelism=1,
+)
+
+# Hash checked against when a username does not exist, so failed logins take as long as a wrong password and
+# do not reveal which usernames are registered
+_DUMMY_HASH = pwd_context.hash("dummy-password")
+
+# Cache of already verified JWT tokens: token -> (username, expiry as a UNIX timestamp).
+# Entries are dropped once they are older than the longest token lifetime, or least recently used first
+# when the cache is full; a hit is still checked against the token's own expiry.
+TOKEN_CACHE_MAX_SIZE = 10_000
+_TOKEN_CACHE: TTLCache = TTLCache(maxsize=TOKEN_CACHE_MAX_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
 
 # Pydantic models to represent users and tokens
 class User(BaseModel):
@@ -35,13 +57,24 @@ class User(BaseModel):
     full_name: Optional[str] = None
 
 
-class UserInDB(User):
+@dataclass(slots=True)
+class UserRecord:
     """
     Represents the user in the database, including the hashed password.
+
+    Users are kept as slotted dataclasses rather than Pydantic models since they are only validated once,
+    at signup; response models are applied at the API boundary.
     """
+    username: str
+    email: str
+    full_name: Optional[str]
     hashed_password: str
 
 
+# User storage shared by all worker processes: username -> UserRecord
+fake_users_db = UserStore(USERS_DB_PATH, UserRecord)
+
+
 class UserCreate(BaseModel):
     """
     Model for creating a new user with a plaintext password.
@@ -71,7 +104,7 @@ class Token(BaseModel):
 # Utility function to hash passwords
 def get_password_hash(password: str) -> str:
     """
-    Hash a plaintext password using bcrypt.
+    Hash a plaintext password using Argon2id.
 
     Args:
         password (str): The plaintext password to be hashed.
@@ -82,19 +115,41 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-# Utility function to verify a password
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+# Utility function to hash several passwords in one call
+def get_password_hashes(passwords: list[str]) -> list[str]:
+    """
+    Hash a batch of plaintext passwords using Argon2id, e.g. in a single round trip to a worker process.
+
+    Args:
+        passwords (list[str]): The plaintext passwords to be hashed.
+
+    Returns:
+        list[str]: The hashed passwords, in the same order.
     """
-    Verify that the provided plaintext password matches the stored hashed password.
+    return [get_password_hash(password) for password in passwords]
+
+
+# Utility function to verify a password, run in the crypto process pool
+def check_password(plain_password: str, hashed_password: Optional[str]) -> tuple[bool, Optional[str]]:
+    """
+    Verify a password against a stored hash and, if that hash uses a deprecated scheme (e.g. legacy bcrypt)
+    or outdated parameters, re-hash the password with the current Argon2id settings.
+
+    When there is no stored hash (unknown username), the password is checked against a dummy hash instead,
+    so the attempt takes as long as one with a wrong password.
 
     Args:
         plain_password (str): The plaintext password to check.
-        hashed_password (str): The stored hashed password.
+        hashed_password (Optional[str]): The stored hashed password, or None if the user does not exist.
 
     Returns:
-        bool: True if the password matches, False otherwise.
+        tuple[bool, Optional[str]]: Whether the password matches, and the replacement hash to store if the
+        stored one should be upgraded (None otherwise).
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    if hashed_password is None:
+        pwd_context.verify(plain_password, _DUMMY_HASH)
+        return False, None
+    return pwd_context.verify_and_update(plain_password, hashed_password)
 
 
 # Utility function to create a JWT access token
@@ -121,23 +176,35 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 
 # Utility function to authenticate a user
-def authenticate_user(db: dict, username: str, password: str) -> Optional[UserInDB]:
+async def authenticate_user(
+    db: UserStore, username: str, password: str, executor: Optional[Executor] = None
+) -> Optional[UserRecord]:
     """
     Authenticate a user by verifying their username and password.
 
+    The password check runs in `executor` (e.g. the crypto process pool), or in the default thread executor
+    if none is given, so it does not block the event loop.
+
     Args:
-        db (dict): The database of users (in-memory).
+        db (UserStore): The database of users.
         username (str): The username to authenticate.
         password (str): The plaintext password to verify.
+        executor (Optional[Executor]): The executor to run the password check in.
 
     Returns:
-        Optional[UserInDB]: The authenticated user if successful, otherwise None.
+        Optional[UserRecord]: The authenticated user if successful, otherwise None.
     """
     user = db.get(username)
-    if not user:
-        return False
-    if not verify_password(password, user.hashed_password):
-        return False
+    loop = asyncio.get_running_loop()
+    verified, new_hash = await loop.run_in_executor(
+        executor, check_password, password, user.hashed_password if user is not None else None
+    )
+    if not verified:
+        return None
+    if new_hash is not None:
+        # Transparently upgrade a legacy hash now that the plaintext password is known
+        user = replace(user, hashed_password=new_hash)
+        db[username] = user
     return user
 
 
@@ -155,6 +222,11 @@ def verify_token(token: str) -> str:
     Raises:
         HTTPException: If the token is invalid or expired.
     """
+    # Return the cached username if this token was already verified and has not expired yet
+    hit = _TOKEN_CACHE.get(token)
+    if hit is not None and hit[1] > time.time():
+        return hit[0]
+
     try:
         # Decode the token using the secret key and algorithm
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -165,6 +237,8 @@ def verify_token(token: str) -> str:
                 detail="Invalid authentication credentials",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        if payload.get("exp") is not None:
+            _TOKEN_CACHE[token] = (username, payload["exp"])
         return username
     except JWTError:
         raise HTTPException(
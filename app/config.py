@@ -6,3 +6,33 @@ from dotenv import load_dotenv
 load_dotenv()
 
 SaaS_API_KEY = os.getenv("SaaS_API_KEY", "test_api_key")
+
+# Deployment environment; "prod" turns off the interactive API docs and the OpenAPI schema
+ENV = os.getenv("ENV", "dev")
+IS_PRODUCTION = ENV == "prod"
+
+# Number of web worker processes serving the app; they share registered users through the LMDB user store
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+# Processes each web worker starts for password hashing. By default the CPU cores are split between the web
+# workers, so the whole server runs about one hashing process per core rather than one per core per worker.
+# gunicorn_conf.py and hypercorn_conf.py default WEB_CONCURRENCY to one worker per core and export it, so each of
+# their workers sees the real worker count here.
+CRYPTO_WORKERS = int(os.getenv("CRYPTO_WORKERS") or max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY))
+
+# LMDB database directory holding the registered users, shared by all workers
+USERS_DB_PATH = os.getenv("USERS_DB_PATH", "users.mdb")
+
+# Maximum size the user database may grow to, in bytes (1 GiB); disk space is only used as it fills up
+USERS_DB_MAP_SIZE = 1 << 30
+
+# Optional Redis server shared by all workers (e.g. redis://localhost:6379)
+REDIS_URL = os.getenv("REDIS_URL") or None
+
+# Storage backend for rate limit counters shared by all workers.
+# Falls back to in-process memory, which keeps separate counters per worker.
+RATE_LIMIT_STORAGE_URI = REDIS_URL or "memory://"
+
+# Rate limiting strategy: "fixed-window" counts hits per window with one atomic INCR+EXPIRE (a single Redis
+# round trip); "moving-window" is stricter at window boundaries but stores a timestamp per hit.
+RATE_LIMIT_STRATEGY = os.getenv("RATE_LIMIT_STRATEGY", "fixed-window")
@@ -1,3 +1,5 @@
+import logging
+
 from fastapi import APIRouter, Header, HTTPException
 from pydantic import BaseModel
 from typing import List
@@ -5,6 +7,8 @@ from typing import List
 # Create an APIRouter instance for the mock SaaS API
 router = APIRouter()
 
+logger = logging.getLogger(__name__)
+
 # Define the expected data format for each customer
 class CustomerData(BaseModel):
     """
@@ -54,8 +58,9 @@ async def submit_data(data: CustomerDataArray, x_api_key: str = Header(...)):
     if x_api_key != MOCK_API_KEY:
         raise HTTPException(status_code=401, detail="Invalid API key")
 
-    # Simulate successful processing of the data
-    print("Received the following data:", data.dict())
+    # Simulate successful processing of the data; the records are only dumped when INFO logging is enabled
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Received the following data: %s", data.model_dump())
 
     # Return a success message with the received data
     return {
@@ -1,4 +1,9 @@
-from pydantic import BaseModel, Field, ValidationError, validator
+import re
+
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
+
+# Names are letters (including non-ASCII letters) and spaces, with at least one letter
+_NAME_RE = re.compile(r"(?=.*[^\W\d_])(?:[^\W\d_]| )+")
 
 
 # Define the OnboardingDataModel using Pydantic for validation
@@ -19,7 +24,8 @@ class OnboardingDataModel(BaseModel):
     age: int = Field(..., gt=0, description="Age must be a positive integer")
 
     # Validator for the 'name' field to ensure that only alphabetic characters and spaces are allowed
-    @validator('name')
+    @field_validator('name')
+    @classmethod
     def name_must_be_alpha(cls, v):
         """
         Custom validator for the 'name' field to ensure it only contains alphabetic characters and spaces.
@@ -33,28 +39,28 @@ class OnboardingDataModel(BaseModel):
         Raises:
             ValueError: If the name contains non-alphabetic characters.
         """
-        if not v.replace(" ", "").isalpha():
+        if not _NAME_RE.fullmatch(v):
             raise ValueError('Name must contain only alphabetic characters and spaces')
         return v
 
 
-# Function to validate data using the OnboardingDataModel
-def validate_onboarding_data(data):
+# Adapter used to validate a whole list of onboarding entries in a single pydantic-core call
+ONBOARDING_ADAPTER = TypeAdapter(list[OnboardingDataModel])
+
+
+# Function to validate a batch of onboarding data using the OnboardingDataModel
+def validate_onboarding_batch(rows):
     """
-    Function to validate onboarding data against the OnboardingDataModel.
+    Function to validate a list of onboarding entries against the OnboardingDataModel in one pass.
 
     Args:
-        data (dict): The dictionary containing the onboarding data (name, email, age).
+        rows (list): The list of dictionaries containing the onboarding data (name, email, age).
 
     Returns:
-        dict: The validated data in dictionary form.
+        list[OnboardingDataModel]: The validated entries, ready to be serialized with `ONBOARDING_ADAPTER.dump_json`.
 
     Raises:
-        ValueError: If any of the data fields fail validation, a JSON-formatted validation error is raised.
+        ValidationError: If any entry fails validation. Each error's `loc` starts with the entry index
+                         followed by the field name.
     """
-    try:
-        # Validate the data against the OnboardingDataModel and return the validated data
-        return OnboardingDataModel(**data).dict()
-    except ValidationError as e:
-        # Raise a ValueError with detailed validation error messages in JSON format
-        raise ValueError(e.json())
+    return ONBOARDING_ADAPTER.validate_python(rows)
@@ -0,0 +1,6 @@
+import os
+import tempfile
+
+# Keep the users registered by the tests in a throwaway database instead of the app's `users.mdb`.
+# This runs before the test modules import the app, so the app picks it up from the environment.
+os.environ["USERS_DB_PATH"] = tempfile.mkdtemp(prefix="users-db-")
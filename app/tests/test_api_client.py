@@ -0,0 +1,38 @@
+import pytest
+from fastapi import HTTPException
+
+from app.utils import api_client
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_are_reported(monkeypatch):
+    """
+    Test case to ensure every failed SaaS API batch is reported while the other batches are still sent.
+
+    Assertions:
+        - Ensure a single batch upload returns a list with one response.
+        - Ensure all batches are attempted even when one of them fails.
+        - Ensure the error lists only the failed batch and the rows it covers.
+    """
+    sent = []
+
+    async def fake_post_data(session, batch):
+        sent.append(batch)
+        if batch[0] == 2:
+            raise HTTPException(status_code=500, detail="Failed to connect to SaaS API: boom")
+        return {"status": "success"}
+
+    monkeypatch.setattr(api_client, "_SESSION", object())
+    monkeypatch.setattr(api_client, "SAAS_BATCH_SIZE", 2)
+    monkeypatch.setattr(api_client, "_post_data", fake_post_data)
+
+    assert await api_client.send_data_to_saas_api([0]) == [{"status": "success"}]
+
+    sent.clear()
+    with pytest.raises(HTTPException) as exc_info:
+        await api_client.send_data_to_saas_api([0, 1, 2, 3, 4])
+
+    assert len(sent) == 3
+    assert exc_info.value.detail["failed_batches"] == [
+        {"batch": 1, "rows": [2, 4], "error": "Failed to connect to SaaS API: boom"}
+    ]
@@ -0,0 +1,36 @@
+import os
+import signal
+
+from fastapi.testclient import TestClient
+from main import app
+
+
+def kill_crypto_workers():
+    """
+    Kill every worker process of the running crypto process pool, as the OOM killer would.
+    """
+    pool = app.state.crypto_pool
+    for process in list(pool._processes.values()):
+        os.kill(process.pid, signal.SIGKILL)
+        process.join()
+    return pool
+
+
+def test_signup_and_login_survive_dead_crypto_worker():
+    """
+    Test that signup and login still succeed after the crypto pool's worker processes died,
+    by running the work again in a new pool.
+    """
+    user = {"username": "pooluser", "password": "poolpassword", "email": "pool@example.com"}
+    with TestClient(app) as client:
+        # Make sure the pool has started its workers before killing them
+        assert client.post("/signup", json=user).status_code == 200
+
+        broken_pool = kill_crypto_workers()
+        response = client.post("/login", json={"username": "pooluser", "password": "wrongpassword"})
+        assert response.status_code == 401
+        assert app.state.crypto_pool is not broken_pool
+
+        kill_crypto_workers()
+        user["username"] = "pooluser2"
+        assert client.post("/signup", json=user).status_code == 200
@@ -0,0 +1,27 @@
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.utils import file_utils
+
+
+@pytest.mark.asyncio
+async def test_save_and_validate_file_rejects_oversized_upload(tmp_path, monkeypatch):
+    """
+    Test case to ensure uploads larger than `MAX_UPLOAD_SIZE` are rejected with HTTP 413.
+
+    Assertions:
+        - Ensure an HTTPException with status code 413 is raised.
+        - Ensure the partially written file is removed from the upload directory.
+    """
+    monkeypatch.setattr(file_utils, "UPLOAD_DIR", tmp_path)
+    monkeypatch.setattr(file_utils, "CHUNK_SIZE", 4)
+    monkeypatch.setattr(file_utils, "MAX_UPLOAD_SIZE", 10)
+
+    upload = UploadFile(file=io.BytesIO(b"name,email,age\n"), filename="data.csv")
+    with pytest.raises(HTTPException) as exc_info:
+        await file_utils.save_and_validate_file(upload)
+
+    assert exc_info.value.status_code == 413
+    assert list(tmp_path.iterdir()) == []
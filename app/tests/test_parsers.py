@@ -0,0 +1,112 @@
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from fastapi import HTTPException
+
+from app.api.upload import handle_docx, handle_pdf, records_from_json
+
+# Sample files shipped with the repository
+SAMPLE_FILES = Path(__file__).resolve().parents[2] / "Sample_files"
+
+# Records contained in the sample PDF and DOCX files
+EXPECTED_NAMES = ["John Doe", "Jane Smith", "Alice Johnson", "Bob Brown", "Charlie Clark"]
+
+
+def test_handle_pdf_extracts_table_rows():
+    """
+    Test case to ensure every table row of the sample PDF is extracted and the header row is skipped.
+
+    Assertions:
+        - Ensure the names are extracted in document order.
+        - Ensure the email and age of the first row are parsed.
+    """
+    records = handle_pdf(str(SAMPLE_FILES / "data.pdf"))
+
+    assert [record["name"] for record in records] == EXPECTED_NAMES
+    assert records[0] == {"name": "John Doe", "email": "john.doe@example.com", "age": 30}
+
+
+def test_handle_docx_extracts_table_rows():
+    """
+    Test case to ensure every table row of the sample DOCX is extracted and the header row is skipped.
+
+    Assertions:
+        - Ensure the names are extracted in document order.
+        - Ensure the email and age of the first row are parsed.
+    """
+    records = handle_docx(str(SAMPLE_FILES / "data.docx"))
+
+    assert [record["name"] for record in records] == EXPECTED_NAMES
+    assert records[0] == {"name": "John Doe", "email": "john@gmail.com", "age": 30}
+
+
+def test_handle_pdf_joins_cells_in_different_fonts(tmp_path):
+    """
+    Test case to ensure table cells drawn in different fonts and sizes on one baseline form a single row.
+
+    Assertions:
+        - Ensure the name, email and age written in three fonts are extracted as one record.
+    """
+    pymupdf = pytest.importorskip("pymupdf")
+    pdf_path = tmp_path / "mixed_fonts.pdf"
+    doc = pymupdf.open()
+    page = doc.new_page()
+    page.insert_text((72, 100), "John Doe", fontname="hebo", fontsize=12)
+    page.insert_text((200, 100), "john@example.com", fontname="cour", fontsize=10)
+    page.insert_text((400, 100), "30", fontname="helv", fontsize=10)
+    doc.save(pdf_path)
+    doc.close()
+
+    assert handle_pdf(str(pdf_path)) == [{"name": "John Doe", "email": "john@example.com", "age": 30}]
+
+
+def test_records_from_json_rejects_columns_of_different_lengths():
+    """
+    Test case to ensure a column-oriented JSON upload with a short column is rejected instead of truncated.
+
+    Assertions:
+        - Ensure columns of equal length are turned into one record per row.
+        - Ensure a column with fewer values raises an HTTP 400 error.
+    """
+    assert records_from_json({"name": ["a", "b"], "email": ["x@y.z", "w@y.z"], "age": [1, 2]}) == [
+        {"name": "a", "email": "x@y.z", "age": 1},
+        {"name": "b", "email": "w@y.z", "age": 2},
+    ]
+
+    with pytest.raises(HTTPException) as exc_info:
+        records_from_json({"name": ["a", "b"], "email": ["x@y.z"], "age": [1, 2]})
+    assert exc_info.value.status_code == 400
+
+
+def test_handle_docx_does_not_expand_external_entities(tmp_path):
+    """
+    Test case to ensure a DOCX declaring an external entity cannot read files from the server (XXE).
+
+    Assertions:
+        - Ensure the referenced file's content does not appear in any extracted value.
+    """
+    secret_path = tmp_path / "secret.txt"
+    secret_path.write_text("TOP-SECRET-VALUE")
+
+    w = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    cells = "".join(f"<w:tc><w:p><w:r><w:t>{text}</w:t></w:r></w:p></w:tc>" for text in ("{name}", "{email}", "{age}"))
+    row = f"<w:tr>{cells}</w:tr>"
+    document_xml = (
+        f'<?xml version="1.0"?><!DOCTYPE d [<!ENTITY xxe SYSTEM "{secret_path.as_uri()}">]>'
+        f'<w:document xmlns:w="{w}"><w:body><w:tbl>'
+        + row.format(name="Name", email="Email", age="Age")
+        + row.format(name="John Doe", email="&xxe;x@y.co", age="30")
+        + "</w:tbl></w:body></w:document>"
+    )
+    docx_path = tmp_path / "xxe.docx"
+    with zipfile.ZipFile(docx_path, "w") as archive:
+        archive.writestr("word/document.xml", document_xml)
+
+    try:
+        records = handle_docx(str(docx_path))
+    except HTTPException:
+        records = []
+
+    assert "TOP-SECRET-VALUE" not in repr(records)
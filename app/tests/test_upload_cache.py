@@ -0,0 +1,26 @@
+import pytest
+from cachetools import TTLCache
+
+from app.utils import upload_cache
+
+
+@pytest.mark.asyncio
+async def test_cached_response_is_returned_for_same_content(monkeypatch):
+    """
+    Test case to ensure the SaaS API response of a processed upload is returned for the same content.
+
+    Assertions:
+        - Ensure nothing is cached before the response is stored.
+        - Ensure the stored response is returned for the same content type and digest.
+        - Ensure the same content uploaded with another content type is not a hit.
+    """
+    monkeypatch.setattr(upload_cache, "_REDIS", None)
+    monkeypatch.setattr(upload_cache, "_LOCAL_CACHE", TTLCache(maxsize=10, ttl=60))
+    key = upload_cache.upload_cache_key("text/csv", "abc123")
+
+    assert await upload_cache.get_cached_response(key) is None
+
+    await upload_cache.cache_response(key, {"status": "success"})
+
+    assert await upload_cache.get_cached_response(key) == {"status": "success"}
+    assert await upload_cache.get_cached_response(upload_cache.upload_cache_key("application/json", "abc123")) is None
@@ -0,0 +1,29 @@
+from app.auth import UserRecord
+from app.utils.user_store import UserStore
+
+
+def test_user_store_keeps_the_first_signup(tmp_path):
+    """
+    Test case to ensure the user store does not overwrite an already registered username on signup.
+
+    Assertions:
+        - Ensure an unknown username is not found.
+        - Ensure the first record stored for a username is returned as is and can be read back.
+        - Ensure a second signup for the same username gets the stored record instead of replacing it.
+        - Ensure item assignment replaces the stored record (e.g. when a password hash is upgraded).
+    """
+    store = UserStore(str(tmp_path), UserRecord)
+    first = UserRecord(username="jane", email="jane@example.com", full_name=None, hashed_password="hash-1")
+    second = UserRecord(username="jane", email="other@example.com", full_name="Jane", hashed_password="hash-2")
+
+    assert "jane" not in store
+    assert store.get("jane") is None
+
+    assert store.setdefault("jane", first) is first
+    assert store.get("jane") == first
+
+    assert store.setdefault("jane", second) == first
+    assert store.get("jane") == first
+
+    store["jane"] = second
+    assert store.get("jane") == second
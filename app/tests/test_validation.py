@@ -0,0 +1,40 @@
+import pytest
+from pydantic import ValidationError
+
+from app.services.validation import validate_onboarding_batch
+
+
+def test_validate_onboarding_batch_returns_validated_entries():
+    """
+    Test case to ensure a valid batch of onboarding entries is validated in a single call.
+
+    Assertions:
+        - Ensure every entry is returned as a model with its fields coerced to the model types.
+    """
+    rows = [
+        {"name": "John Doe", "email": "john.doe@example.com", "age": 30},
+        {"name": "Jane Smith", "email": "jane.smith@example.com", "age": "25"},
+    ]
+
+    assert [model.model_dump() for model in validate_onboarding_batch(rows)] == [
+        {"name": "John Doe", "email": "john.doe@example.com", "age": 30},
+        {"name": "Jane Smith", "email": "jane.smith@example.com", "age": 25},
+    ]
+
+
+def test_validate_onboarding_batch_reports_failing_column():
+    """
+    Test case to ensure a validation error points at the failing entry and column.
+
+    Assertions:
+        - Ensure a ValidationError is raised whose first error location is (entry index, column name).
+    """
+    rows = [
+        {"name": "John Doe", "email": "john.doe@example.com", "age": 30},
+        {"name": "Jane Smith", "email": "not-an-email", "age": 25},
+    ]
+
+    with pytest.raises(ValidationError) as exc_info:
+        validate_onboarding_batch(rows)
+
+    assert exc_info.value.errors()[0]["loc"] == (1, "email")
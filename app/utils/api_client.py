@@ -1,7 +1,12 @@
+import asyncio
 import os
+from typing import Optional
+
 import aiohttp
+import orjson
 from fastapi import HTTPException
 from dotenv import load_dotenv  # Import dotenv to load .env variables
+from app.services.validation import ONBOARDING_ADAPTER
 
 # Load environment variables from .env file
 load_dotenv()
@@ -13,43 +18,148 @@ SAAS_API_URL = os.getenv("SAAS_API_URL")
 # Construct the full SaaS API URL by appending the submit endpoint
 MOCK_SAAS_API_URL = f"{SAAS_API_URL}/api/saas/submit"
 
+# Number of records sent to the SaaS API in a single request
+SAAS_BATCH_SIZE = 1000
+
+# Maximum number of batch requests in flight at once for a single upload
+SAAS_MAX_CONCURRENCY = 16
+
+# Shared HTTP session reused across requests, opened at application startup and closed at shutdown
+_SESSION: Optional[aiohttp.ClientSession] = None
+
+
+async def open_saas_session():
+    """
+    Open the shared HTTP session used to talk to the SaaS API.
+
+    Reusing one session keeps connections to the SaaS API alive between uploads, so each
+    request does not pay for a new DNS lookup, TCP connection and TLS handshake.
+    """
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300))
+
+
+async def close_saas_session():
+    """
+    Close the shared HTTP session opened by `open_saas_session`.
+    """
+    global _SESSION
+    if _SESSION is not None:
+        await _SESSION.close()
+        _SESSION = None
+
+
 async def send_data_to_saas_api(data):
     """
     Function to send validated onboarding data to the mock SaaS API.
 
-    This function uses an asynchronous HTTP session to send the POST request with
-    the customer data in a JSON format to the SaaS API. The API key is included
-    in the request headers for authentication. If the request is unsuccessful,
-    it raises an HTTP exception.
+    The data is split into batches of `SAAS_BATCH_SIZE` records that are sent concurrently,
+    with at most `SAAS_MAX_CONCURRENCY` requests in flight, using the shared asynchronous
+    HTTP session. If the shared session has not been opened (e.g. the application lifespan
+    did not run), a temporary session is used instead. The API key is included in the
+    request headers for authentication.
+
+    Batches are sent independently, so when some of them fail the others may already have been
+    delivered. In that case an HTTP exception lists the failed batches and the rows they cover,
+    so only those need to be sent again.
 
     Args:
-        data (list): A list of customer data dictionaries to be sent to the SaaS API.
+        data (list[OnboardingDataModel]): The validated customer data to be sent to the SaaS API.
 
     Returns:
-        dict: The JSON response from the SaaS API, containing the status of the request.
+        list[dict]: The JSON responses from the SaaS API, one per batch in batch order
+                    (a single one when the data fits in one batch).
 
     Raises:
-        HTTPException: If the API key is invalid, or if there's an issue communicating
-                       with the SaaS API (e.g., network errors or server errors).
+        HTTPException: If any batch could not be delivered, e.g. because the API key is invalid
+                       or because of network or server errors.
     """
-    async with aiohttp.ClientSession() as session:
-        # Prepare the headers, including the API key
-        headers = {
-            "x-api-key": SaaS_API_KEY
+    # Split the data into batches; an empty upload is still sent as a single (empty) batch
+    batches = [data[i:i + SAAS_BATCH_SIZE] for i in range(0, len(data), SAAS_BATCH_SIZE)] or [data]
+
+    if _SESSION is not None:
+        responses = await _send_batches(_SESSION, batches)
+    else:
+        async with aiohttp.ClientSession() as session:
+            responses = await _send_batches(session, batches)
+
+    # Report every failed batch rather than only the first one, since the rest were delivered
+    failed = [
+        {
+            "batch": index,
+            "rows": [index * SAAS_BATCH_SIZE, index * SAAS_BATCH_SIZE + len(batches[index])],
+            "error": response.detail if isinstance(response, HTTPException) else str(response),
         }
-        try:
-            # Wrap the data into a dictionary with the key "data"
-            payload = {"data": data}
-
-            # Send a POST request to the SaaS API with the data
-            async with session.post(MOCK_SAAS_API_URL, json=payload, headers=headers) as response:
-                # Check if the response status is not 200 (OK)
-                if response.status != 200:
-                    raise HTTPException(status_code=response.status, detail="Error communicating with SaaS API")
-
-                # Return the JSON response from the SaaS API
-                return await response.json()
-
-        except Exception as e:
-            # Raise an HTTPException if an error occurs while sending the data
-            raise HTTPException(status_code=500, detail=f"Failed to connect to SaaS API: {str(e)}")
+        for index, response in enumerate(responses)
+        if isinstance(response, BaseException)
+    ]
+    if failed:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "message": f"Failed to send {len(failed)} of {len(batches)} batches to the SaaS API; "
+                           "the other batches were delivered",
+                "failed_batches": failed,
+            },
+        )
+
+    return responses
+
+
+async def _send_batches(session: aiohttp.ClientSession, batches):
+    """
+    Send the batches to the SaaS API concurrently, bounded by `SAAS_MAX_CONCURRENCY`.
+
+    Args:
+        session (aiohttp.ClientSession): The HTTP session to send the requests with.
+        batches (list): The batches of validated customer data.
+
+    Returns:
+        list: The JSON response from the SaaS API for each batch, in batch order, or the exception
+              raised while sending it.
+    """
+    semaphore = asyncio.Semaphore(SAAS_MAX_CONCURRENCY)
+
+    async def send_batch(batch):
+        async with semaphore:
+            return await _post_data(session, batch)
+
+    return await asyncio.gather(*(send_batch(batch) for batch in batches), return_exceptions=True)
+
+
+async def _post_data(session: aiohttp.ClientSession, data):
+    """
+    Send the onboarding data to the SaaS API using the given session.
+
+    Args:
+        session (aiohttp.ClientSession): The HTTP session to send the request with.
+        data (list[OnboardingDataModel]): The validated customer data to be sent to the SaaS API.
+
+    Returns:
+        dict: The JSON response from the SaaS API.
+
+    Raises:
+        HTTPException: If the request fails or the SaaS API does not respond with HTTP 200.
+    """
+    # Prepare the headers, including the API key and the content type of the pre-encoded body
+    headers = {
+        "x-api-key": SaaS_API_KEY,
+        "Content-Type": "application/json"
+    }
+    try:
+        # Serialize the validated models straight to JSON bytes and wrap them under the key "data"
+        body = b'{"data":' + ONBOARDING_ADAPTER.dump_json(data) + b'}'
+
+        # Send a POST request to the SaaS API with the data
+        async with session.post(MOCK_SAAS_API_URL, data=body, headers=headers) as response:
+            # Check if the response status is not 200 (OK)
+            if response.status != 200:
+                raise HTTPException(status_code=response.status, detail="Error communicating with SaaS API")
+
+            # Return the JSON response from the SaaS API
+            return orjson.loads(await response.read())
+
+    except Exception as e:
+        # Raise an HTTPException if an error occurs while sending the data
+        raise HTTPException(status_code=500, detail=f"Failed to connect to SaaS API: {str(e)}")
@@ -1,52 +1,68 @@
 import os
+import uuid
+import aiofiles
+import blake3
 from fastapi import HTTPException, UploadFile
 from pathlib import Path
-import time
 
 # Define the upload directory relative to the current working directory
 UPLOAD_DIR = Path("uploads/")
 
+# Create the upload directory once at import time, including parent directories, instead of on every upload
+UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+
+# Size of each chunk read from the upload stream and written to disk (1 MiB)
+CHUNK_SIZE = 1 << 20
+
+# Maximum accepted upload size in bytes (50 MiB)
+MAX_UPLOAD_SIZE = 50 << 20
+
 async def save_and_validate_file(file: UploadFile):
     """
     Save and validate an uploaded file.
 
     This function saves the uploaded file to the `uploads/` directory after validating
-    its file extension. If a file with the same name exists, it appends a timestamp
-    to the filename to make it unique.
+    its file extension. The file is stored under a random UUID name that keeps the
+    original extension, so concurrent uploads of the same file name never collide.
+    The upload is streamed to disk in chunks so memory use stays flat regardless of
+    the file size, and its content is hashed with BLAKE3 while it is written.
 
     Args:
         file (UploadFile): The file uploaded via FastAPI's `UploadFile`.
 
     Returns:
-        Path: The path to the saved file.
+        tuple[Path, str]: The path to the saved file and the hex digest of its content.
 
     Raises:
-        HTTPException: If the file extension is not supported.
+        HTTPException: If the file extension is not supported (400) or the file is larger
+                       than `MAX_UPLOAD_SIZE` (413).
     """
-    # Create the upload directory if it doesn't exist
-    if not UPLOAD_DIR.exists():
-        UPLOAD_DIR.mkdir(parents=True, exist_ok=True)  # Create the directory, including parent directories
-
-    # Sanitize the file name to avoid directory traversal attacks
-    filename = os.path.basename(file.filename)
-    file_path = UPLOAD_DIR / filename
+    # Only the extension of the client-supplied name is used, which also rules out directory traversal
+    suffix = Path(os.path.basename(file.filename)).suffix
 
     # Validate file extension to only allow specific formats
-    if file_path.suffix not in ['.csv', '.xlsx', '.pdf', '.docx', '.json']:
+    if suffix not in ['.csv', '.xlsx', '.pdf', '.docx', '.json']:
         # Raise an exception if the file type is not supported
         raise HTTPException(status_code=400, detail="Unsupported file type")
 
-    # Check if a file with the same name already exists
-    if file_path.exists():
-        # Append a timestamp to the file name to ensure uniqueness
-        timestamp = int(time.time())
-        new_filename = f"{file_path.stem}_{timestamp}{file_path.suffix}"
-        file_path = UPLOAD_DIR / new_filename
+    # Give the saved file a unique name without checking what already exists on disk
+    file_path = UPLOAD_DIR / f"{uuid.uuid4().hex}{suffix}"
+
+    # Save the file securely by streaming its contents to the determined file path
+    size = 0
+    hasher = blake3.blake3()
+    async with aiofiles.open(file_path, "wb") as buffer:
+        while chunk := await file.read(CHUNK_SIZE):
+            size += len(chunk)
+            if size > MAX_UPLOAD_SIZE:
+                break
+            hasher.update(chunk)
+            await buffer.write(chunk)
 
-    # Save the file securely by writing its contents to the determined file path
-    with open(file_path, "wb") as buffer:
-        # Read the uploaded file and write it to the designated location
-        buffer.write(await file.read())
+    if size > MAX_UPLOAD_SIZE:
+        # Discard the partially written file and reject the upload
+        os.remove(file_path)
+        raise HTTPException(status_code=413, detail="File too large")
 
-    # Return the path of the saved file
-    return file_path
+    # Return the path of the saved file and the hash of its content
+    return file_path, hasher.hexdigest()
@@ -1,7 +1,9 @@
 import logging
+import os
 
 # Configure the logging settings
-logging.basicConfig(level=logging.INFO)  # Set logging level to INFO or higher
+# The level defaults to WARNING for production and can be lowered (e.g. LOG_LEVEL=INFO) for debugging
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING").upper())
 logger = logging.getLogger(__name__)  # Create a logger instance with the current module's name
 
 def log_error(error):
@@ -10,9 +12,10 @@ def log_error(error):
 
     This function accepts an error object or message and logs it at the ERROR level,
     allowing the developer to capture important errors in the application for debugging purposes.
+    When an Exception object is given, its traceback is included in the log record.
 
     Args:
         error (Exception or str): The error message or Exception object that needs to be logged.
     """
-    # Log the error message at the ERROR level
-    logger.error(f"Error: {error}")
+    # Log the error message at the ERROR level; formatting is deferred until a handler emits the record
+    logger.error("Error: %s", error, exc_info=error if isinstance(error, BaseException) else None)
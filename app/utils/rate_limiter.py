@@ -0,0 +1,15 @@
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+
+from app.config import RATE_LIMIT_STORAGE_URI, RATE_LIMIT_STRATEGY, REDIS_URL
+
+# Shared rate limiter used by every rate-limited route.
+# Counters are keyed by the client address; when running behind a reverse proxy, start uvicorn with
+# `--proxy-headers --forwarded-allow-ips=<proxy ip>` so the address is taken from `X-Forwarded-For`.
+# If Redis becomes unreachable, counting temporarily falls back to in-process memory instead of failing requests.
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=RATE_LIMIT_STORAGE_URI,
+    strategy=RATE_LIMIT_STRATEGY,
+    in_memory_fallback_enabled=REDIS_URL is not None,
+)
@@ -0,0 +1,98 @@
+from typing import Optional
+
+import orjson
+from cachetools import TTLCache
+from redis import asyncio as aioredis
+
+from app.config import REDIS_URL
+from app.utils.logger import log_error
+
+# How long the SaaS API response of a processed upload is remembered, in seconds (24 hours)
+UPLOAD_CACHE_TTL = 24 * 60 * 60
+
+# Maximum number of entries kept by the in-process cache used when Redis is not configured
+UPLOAD_CACHE_MAX_SIZE = 1_000
+
+# Timeout for connecting to Redis and for each Redis command, in seconds.
+# Kept short so an unreachable Redis turns into a quick cache miss instead of stalling the upload.
+UPLOAD_CACHE_REDIS_TIMEOUT = 0.5
+
+# Redis client shared by all requests, or None to use the in-process cache
+_REDIS = (
+    aioredis.from_url(
+        REDIS_URL, socket_connect_timeout=UPLOAD_CACHE_REDIS_TIMEOUT, socket_timeout=UPLOAD_CACHE_REDIS_TIMEOUT
+    )
+    if REDIS_URL
+    else None
+)
+
+# In-process cache: key -> JSON-encoded SaaS API response.
+# Expired entries are dropped as new ones are stored, and the least recently used ones when it is full.
+_LOCAL_CACHE: TTLCache = TTLCache(maxsize=UPLOAD_CACHE_MAX_SIZE, ttl=UPLOAD_CACHE_TTL)
+
+
+def upload_cache_key(content_type: str, digest: str) -> str:
+    """
+    Build the cache key of an upload from its content type and the hash of its content.
+
+    Args:
+        content_type (str): The content type reported for the uploaded file.
+        digest (str): The hex digest of the uploaded file's content.
+
+    Returns:
+        str: The cache key.
+    """
+    # The version changes whenever the shape of the cached SaaS API response does
+    return f"upload:v2:{content_type}:{digest}"
+
+
+async def get_cached_response(key: str) -> Optional[dict]:
+    """
+    Return the SaaS API response stored for an already processed upload.
+
+    Cache failures are logged and treated as a miss, so they never fail the upload.
+
+    Args:
+        key (str): The cache key built by `upload_cache_key`.
+
+    Returns:
+        Optional[dict]: The stored SaaS API response, or None if the upload was not seen recently.
+    """
+    try:
+        if _REDIS is not None:
+            value = await _REDIS.get(key)
+        else:
+            value = _LOCAL_CACHE.get(key)
+        return orjson.loads(value) if value is not None else None
+    except Exception as e:
+        log_error(e)
+        return None
+
+
+async def cache_response(key: str, response) -> None:
+    """
+    Store the SaaS API response of a successfully processed upload for `UPLOAD_CACHE_TTL` seconds.
+
+    Cache failures are logged and ignored.
+
+    Args:
+        key (str): The cache key built by `upload_cache_key`.
+        response: The JSON-serializable SaaS API response.
+    """
+    try:
+        value = orjson.dumps(response)
+        if _REDIS is not None:
+            await _REDIS.set(key, value, ex=UPLOAD_CACHE_TTL)
+            return
+
+        _LOCAL_CACHE[key] = value
+    except Exception as e:
+        log_error(e)
+
+
+async def close_upload_cache() -> None:
+    """
+    Close the connections of the Redis client, if one is configured.
+    """
+    if _REDIS is not None:
+        await _REDIS.aclose()
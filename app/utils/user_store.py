@@ -0,0 +1,89 @@
+import os
+import threading
+from typing import Any, Optional
+
+import lmdb
+import msgspec
+
+from app.config import USERS_DB_MAP_SIZE
+
+
+class UserStore:
+    """
+    User records kept in an LMDB database on disk, shared by every worker process: username -> record.
+
+    Supports the dict operations the app relies on (`in`, `get`, item assignment and `setdefault`), so it can
+    stand in for an in-memory dict. Records are encoded as MessagePack with msgspec. Reads go through
+    LMDB's memory map without locking; writes are serialized across processes by LMDB itself.
+
+    The environment is opened lazily, on first use in each process, because an LMDB handle must not be
+    used across a fork (e.g. gunicorn's `preload_app`).
+    """
+
+    def __init__(self, path: str, record_type: type, map_size: int = USERS_DB_MAP_SIZE):
+        """
+        Args:
+            path (str): Directory holding the LMDB database; created if it does not exist.
+            record_type (type): The type records are decoded into (e.g. `UserRecord`).
+            map_size (int): Maximum size of the database in bytes.
+        """
+        self.path = path
+        self.map_size = map_size
+        self._encoder = msgspec.msgpack.Encoder()
+        self._decoder = msgspec.msgpack.Decoder(record_type)
+        self._env: Optional[lmdb.Environment] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _get_env(self) -> lmdb.Environment:
+        """
+        Return this process's LMDB environment, opening it on first use.
+
+        Returns:
+            lmdb.Environment: The open environment.
+        """
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._env = lmdb.open(self.path, map_size=self.map_size)
+                    self._pid = os.getpid()
+        return self._env
+
+    def get(self, username: str, default: Any = None) -> Any:
+        """
+        Return the record stored for a username.
+
+        Args:
+            username (str): The username to look up.
+            default (Any): The value returned when the username is not registered.
+
+        Returns:
+            Any: The decoded record, or `default`.
+        """
+        with self._get_env().begin() as txn:
+            data = txn.get(username.encode())
+        return default if data is None else self._decoder.decode(data)
+
+    def __contains__(self, username: str) -> bool:
+        with self._get_env().begin() as txn:
+            return txn.get(username.encode()) is not None
+
+    def __setitem__(self, username: str, record: Any) -> None:
+        with self._get_env().begin(write=True) as txn:
+            txn.put(username.encode(), self._encoder.encode(record))
+
+    def setdefault(self, username: str, record: Any) -> Any:
+        """
+        Store a record unless the username is already registered, atomically across all processes.
+
+        Args:
+            username (str): The username to register.
+            record (Any): The record to store.
+
+        Returns:
+            Any: `record` itself if it was stored, otherwise the record already stored for the username.
+        """
+        with self._get_env().begin(write=True) as txn:
+            if txn.put(username.encode(), self._encoder.encode(record), overwrite=False):
+                return record
+            return self._decoder.decode(txn.get(username.encode()))
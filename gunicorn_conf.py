@@ -0,0 +1,17 @@
+import os
+
+# Gunicorn configuration for serving the app with uvicorn workers.
+# Start with: gunicorn main:app -c gunicorn_conf.py
+
+bind = f"{os.getenv('HOST', '127.0.0.1')}:{os.getenv('PORT', '8000')}"
+
+# Uvicorn's worker picks uvloop's event loop and the httptools HTTP parser when they are installed.
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# One worker per CPU core by default, exported to the workers (see CRYPTO_WORKERS in app/config.py)
+workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count()))
+os.environ["WEB_CONCURRENCY"] = str(workers)
+
+# Import the app once in the master so workers fork with it already loaded.
+# Connections, process pools and the user database are only opened after the fork, in each worker.
+preload_app = True
@@ -0,0 +1,25 @@
+import os
+
+# Hypercorn configuration for serving the app over HTTP/2 (and optionally HTTP/3), so clients polling
+# endpoints such as `/limited` can multiplex their requests over one long-lived connection.
+# Start with: hypercorn -c file:hypercorn_conf.py main:app
+
+bind = [f"{os.getenv('HOST', '127.0.0.1')}:{os.getenv('PORT', '8443')}"]
+
+# Browsers only negotiate HTTP/2 over TLS (ALPN); without a certificate, only h2c-capable clients use HTTP/2.
+certfile = os.getenv("TLS_CERTFILE") or None
+keyfile = os.getenv("TLS_KEYFILE") or None
+
+# HTTP/3 over QUIC on the same address, only available with TLS and the `hypercorn[h3]` extra (aioquic)
+if certfile and os.getenv("ENABLE_HTTP3") == "1":
+    quic_bind = bind
+
+# Keep idle connections open so repeat clients skip the TCP and TLS handshakes
+keep_alive_timeout = 75  # Seconds
+
+# Run on uvloop's event loop
+worker_class = "uvloop"
+
+# One worker per CPU core by default, exported to the workers (see CRYPTO_WORKERS in app/config.py)
+workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count()))
+os.environ["WEB_CONCURRENCY"] = str(workers)
@@ -1,45 +1,116 @@
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
 from datetime import timedelta
+import orjson
+import uvicorn
+from cachetools import TTLCache
 from fastapi import FastAPI, Request, HTTPException, status, Depends
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from fastapi.responses import JSONResponse
+from slowapi import _rate_limit_exceeded_handler
+from fastapi.responses import ORJSONResponse, Response
 
 from app.api.upload import router as upload_router  # Importing the file upload router
 from app.auth import (
-    UserLogin, User, UserCreate, fake_users_db, get_password_hash, UserInDB, Token, authenticate_user,
+    UserLogin, User, UserCreate, fake_users_db, get_password_hashes, authenticate_user, UserRecord, Token,
     ACCESS_TOKEN_EXPIRE_MINUTES, create_access_token
 )  # Importing authentication utilities and models
+from app.config import CRYPTO_WORKERS, IS_PRODUCTION, WEB_CONCURRENCY  # Deployment settings
 from app.mock_saas.mock_saas_api import router as mock_saas_api_router  # Importing the mock SaaS API router
+from app.utils.api_client import open_saas_session, close_saas_session  # Shared SaaS API HTTP session
+from app.utils.logger import log_error  # Error logging
+from app.utils.rate_limiter import limiter  # Shared rate limiter keyed by the client's address
+from app.utils.upload_cache import close_upload_cache  # Cache of already processed uploads
 
-# Initialize rate limiter with a key function that uses the request's remote address for rate limiting
-limiter = Limiter(key_func=get_remote_address)
+# Signed access tokens reused for repeat logins of the same user within a short window:
+# (username, window number) -> token. Keying on the window means a reused token is never older than the window.
+TOKEN_REUSE_WINDOW = 15  # Seconds
+_jwt_cache = TTLCache(maxsize=10_000, ttl=TOKEN_REUSE_WINDOW)
+_jwt_cache_lock = threading.Lock()
 
-# Initialize FastAPI app
-app = FastAPI()
+# Recent successful logins: (username, SHA-256 of the password) -> user, so repeat logins skip the slow
+# password hash check. Only a digest of the password is kept, never the plaintext.
+AUTH_CACHE_TTL = 10  # Seconds
+_auth_cache = TTLCache(maxsize=50_000, ttl=AUTH_CACHE_TTL)
+_auth_cache_lock = threading.Lock()
+
+# Signup password hashing is queued and handed to the crypto process pool in batches of up to
+# `HASH_BATCH_SIZE` passwords, one batch per pool worker at a time, so a burst of signups costs one
+# inter-process round trip per batch and cannot occupy more workers than the pool has.
+HASH_BATCH_SIZE = 16
+
+# The `/limited` body never changes, so it is encoded once instead of on every request.
+# A new Response is still built per request because the rate limiter may write headers onto it.
+LIMITED_BODY = orjson.dumps({"message": "This is a rate-limited route"})
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan handler.
+
+    On startup, opens the shared HTTP session used to reach the SaaS API, starts the process pool that
+    runs password hashing on separate cores and the tasks that feed it queued signup passwords. On shutdown,
+    stops and closes them together with the upload cache's Redis connections.
+    """
+    await open_saas_session()
+    app.state.crypto_pool = new_crypto_pool()
+    app.state.hash_queue = asyncio.Queue()
+    hash_workers = [
+        asyncio.create_task(hash_worker(app.state.hash_queue, CRYPTO_WORKERS))
+        for _ in range(CRYPTO_WORKERS)
+    ]
+    yield
+    for task in hash_workers:
+        task.cancel()
+    await asyncio.gather(*hash_workers, return_exceptions=True)
+    app.state.hash_queue = None
+    app.state.crypto_pool.shutdown(cancel_futures=True)
+    app.state.crypto_pool = None
+    await close_saas_session()
+    await close_upload_cache()
+
+
+# Initialize FastAPI app, encoding every JSON response with orjson.
+# In production the interactive docs and the OpenAPI schema are not served.
+app = FastAPI(
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+    docs_url=None if IS_PRODUCTION else "/docs",
+    redoc_url=None if IS_PRODUCTION else "/redoc",
+    openapi_url=None if IS_PRODUCTION else "/openapi.json",
+)
+
+# Skip uvicorn's per-request access log line in production
+if IS_PRODUCTION:
+    logging.getLogger("uvicorn.access").disabled = True
 
 # Set the rate limit exceeded handler for the app
 # This handles responses when the rate limit is exceeded (HTTP status code 429)
 app.state.limiter = limiter
 app.add_exception_handler(429, _rate_limit_exceeded_handler)
 
-# Register API routers
-app.include_router(upload_router)  # File upload functionality
-app.include_router(mock_saas_api_router)  # Mock SaaS API functionality
-
 
 @app.post("/signup", response_model=User)
-def signup(user: UserCreate):
+async def signup(user: UserCreate):
     """
     Endpoint to register a new user.
 
-    This function checks if the username already exists, hashes the password, and stores the user in an
-    in-memory database (`fake_users_db`). If the username is already taken, it raises an HTTP 400 error.
+    This function checks if the username already exists, hashes the password, and stores the user in the
+    user database shared by all workers (`fake_users_db`). If the username is already taken, it raises an HTTP 400 error.
+    Password hashing is queued to run in the crypto process pool so it does not block the event loop.
 
     Args:
         user (UserCreate): The user data including username, password, email, and optional full name.
 
     Returns:
-        UserInDB: The user data stored in the database without the plaintext password.
+        UserRecord: The stored user, returned without the hashed password (filtered by the `User` response model).
 
     Raises:
         HTTPException: If the username already exists.
@@ -48,21 +119,29 @@ def signup(user: UserCreate):
     if user.username in fake_users_db:
         raise HTTPException(status_code=400, detail="Username already registered")
 
-    # Hash the password and store the user in the in-memory database
-    hashed_password = get_password_hash(user.password)
-    user_in_db = UserInDB(**user.dict(), hashed_password=hashed_password)
-    fake_users_db[user.username] = user_in_db
+    # Hash the password off the event loop and store the user in the user database
+    hashed_password = await hash_password(user.password)
+    user_in_db = UserRecord(
+        username=user.username, email=user.email, full_name=user.full_name, hashed_password=hashed_password
+    )
+
+    # Another request may have registered the same username while the password was being hashed
+    if fake_users_db.setdefault(user.username, user_in_db) is not user_in_db:
+        raise HTTPException(status_code=400, detail="Username already registered")
 
     return user_in_db  # Return the created user
 
 
 @app.post("/login", response_model=Token)
-def login(user: UserLogin):
+async def login(user: UserLogin):
     """
     Endpoint for user login and JWT token generation.
 
     This function authenticates the user by verifying the provided username and password. If the credentials
     are correct, a JWT access token is generated and returned. If authentication fails, an HTTP 401 error is raised.
+    Password verification runs in the crypto process pool and token signing in the default executor, so
+    neither blocks the event loop.
+    Repeat logins of the same user within `TOKEN_REUSE_WINDOW` seconds reuse the token that was already signed.
 
     Args:
         user (UserLogin): The login credentials (username and password).
@@ -74,7 +153,8 @@ def login(user: UserLogin):
         HTTPException: If the credentials are incorrect.
     """
     # Authenticate the user using the provided username and password
-    user_in_db = authenticate_user(fake_users_db, user.username, user.password)
+    loop = asyncio.get_running_loop()
+    user_in_db = await authenticate_cached(user.username, user.password)
     if not user_in_db:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -82,14 +162,161 @@ def login(user: UserLogin):
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Generate a JWT token with an expiration time
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(data={"sub": user_in_db.username}, expires_delta=access_token_expires)
+    # Reuse the token signed for this user in the current window, if any
+    cache_key = (user_in_db.username, int(time.time() // TOKEN_REUSE_WINDOW))
+    with _jwt_cache_lock:
+        access_token = _jwt_cache.get(cache_key)
+
+    if access_token is None:
+        # Generate a JWT token with an expiration time
+        access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        access_token = await loop.run_in_executor(
+            None, create_access_token, {"sub": user_in_db.username}, access_token_expires
+        )
+        with _jwt_cache_lock:
+            _jwt_cache[cache_key] = access_token
 
     # Return the generated token
     return {"access_token": access_token, "token_type": "bearer"}
 
 
+async def authenticate_cached(username: str, password: str):
+    """
+    Authenticate a user, reusing the result of a successful check made in the last `AUTH_CACHE_TTL` seconds.
+
+    Failed attempts are not cached, so a wrong password is always checked against the stored hash.
+    The check itself runs in the crypto process pool.
+
+    Args:
+        username (str): The username to authenticate.
+        password (str): The plaintext password to verify.
+
+    Returns:
+        Optional[UserRecord]: The authenticated user if successful, otherwise None.
+    """
+    cache_key = (username, hashlib.sha256(password.encode()).digest())
+    with _auth_cache_lock:
+        user_in_db = _auth_cache.get(cache_key)
+    if user_in_db is not None:
+        return user_in_db
+
+    pool = get_crypto_pool()
+    try:
+        user_in_db = await authenticate_user(fake_users_db, username, password, pool)
+    except BrokenProcessPool:
+        user_in_db = await authenticate_user(fake_users_db, username, password, renew_crypto_pool(pool))
+    if user_in_db is None:
+        return None
+
+    with _auth_cache_lock:
+        _auth_cache[cache_key] = user_in_db
+    return user_in_db
+
+
+async def hash_password(password: str) -> str:
+    """
+    Hash a password through the signup hashing queue, or directly in the default thread executor when the
+    application lifespan has not run (see `get_crypto_pool`).
+
+    Args:
+        password (str): The plaintext password to be hashed.
+
+    Returns:
+        str: The hashed password.
+    """
+    loop = asyncio.get_running_loop()
+    hash_queue = getattr(app.state, "hash_queue", None)
+    if hash_queue is None:
+        return (await loop.run_in_executor(None, get_password_hashes, [password]))[0]
+
+    future = loop.create_future()
+    await hash_queue.put((password, future))
+    return await future
+
+
+async def hash_worker(hash_queue: asyncio.Queue, workers: int):
+    """
+    Hash queued passwords in batches in the crypto process pool, resolving each request's future.
+
+    Each batch takes a fair share of the passwords waiting in the queue across `workers` concurrent
+    workers, capped at `HASH_BATCH_SIZE`.
+
+    Args:
+        hash_queue (asyncio.Queue): Queue of `(password, future)` pairs to hash.
+        workers (int): Number of workers draining the queue concurrently.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        # Wait for a password, then take the ones queued behind it up to this worker's share
+        batch = [await hash_queue.get()]
+        batch_size = min(HASH_BATCH_SIZE, 1 + hash_queue.qsize() // workers)
+        while len(batch) < batch_size and not hash_queue.empty():
+            batch.append(hash_queue.get_nowait())
+
+        passwords = [password for password, _ in batch]
+        pool = get_crypto_pool()
+        try:
+            try:
+                hashes = await loop.run_in_executor(pool, get_password_hashes, passwords)
+            except BrokenProcessPool:
+                hashes = await loop.run_in_executor(renew_crypto_pool(pool), get_password_hashes, passwords)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            continue
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+
+        for (_, future), hashed_password in zip(batch, hashes):
+            # The request may have been cancelled (e.g. client disconnected) while its batch was being hashed
+            if not future.done():
+                future.set_result(hashed_password)
+
+
+def get_crypto_pool():
+    """
+    Return the process pool used for password hashing, or None to use the default thread executor when the
+    application lifespan has not run (e.g. a TestClient used without a `with` block).
+    """
+    return getattr(app.state, "crypto_pool", None)
+
+
+def new_crypto_pool() -> ProcessPoolExecutor:
+    """
+    Start a process pool for password hashing.
+
+    Its workers are spawned rather than forked, so they do not inherit the event loop, open sockets or
+    the user database handle of the web worker.
+
+    Returns:
+        ProcessPoolExecutor: The new pool.
+    """
+    return ProcessPoolExecutor(max_workers=CRYPTO_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+
+
+def renew_crypto_pool(broken_pool: ProcessPoolExecutor) -> ProcessPoolExecutor:
+    """
+    Replace the crypto process pool after one of its worker processes died (e.g. killed for running out
+    of memory), which leaves the pool refusing all further work.
+
+    Requests that failed on the same broken pool all call this; only the first one replaces it.
+
+    Args:
+        broken_pool (ProcessPoolExecutor): The pool that raised `BrokenProcessPool`.
+
+    Returns:
+        ProcessPoolExecutor: The pool to retry the failed work in.
+    """
+    if app.state.crypto_pool is broken_pool:
+        log_error("A password hashing worker process died; starting a new pool")
+        app.state.crypto_pool = new_crypto_pool()
+        broken_pool.shutdown(wait=False, cancel_futures=True)
+    return app.state.crypto_pool
+
+
 @app.get("/limited")
 @limiter.limit("10/minute")  # Apply a rate limit of 10 requests per minute to this endpoint
 async def limited_route(request: Request):
@@ -103,6 +330,25 @@ async def limited_route(request: Request):
         request (Request): The request object (required by the rate limiter).
 
     Returns:
-        JSONResponse: A message indicating the rate-limited route.
+        Response: A JSON message indicating the rate-limited route.
     """
-    return JSONResponse(content={"message": "This is a rate-limited route"})
+    return Response(content=LIMITED_BODY, media_type="application/json")
+
+
+# Register API routers after the routes above, so the hot `/limited`, `/signup` and `/login` routes are matched first
+app.include_router(upload_router, tags=["upload"])  # File upload functionality
+app.include_router(mock_saas_api_router, tags=["mock-saas"])  # Mock SaaS API functionality
+
+
+if __name__ == "__main__":
+    # Serve the app with uvloop's event loop and the httptools HTTP parser.
+    # Workers share registered users through the LMDB user store.
+    uvicorn.run(
+        "main:app",
+        host=os.getenv("HOST", "127.0.0.1"),
+        port=int(os.getenv("PORT", "8000")),
+        loop="uvloop",
+        http="httptools",
+        workers=WEB_CONCURRENCY,
+        access_log=not IS_PRODUCTION,
+    )